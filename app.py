@@ -1,11 +1,19 @@
 import asyncio
+import logging
 import random
 import streamlit as st
 import os
 from mlqs import MultiLevelQueueScheduler, add_processes
 from plots import plot_results, plot_average_wait_time
 
-async def run_simulation_dynamic(num_cpus, total_processes, processes_per_second, speedup_simulation, burst_time, interactive_burst_time_range, use_random_interactive_burst, time_quantum):
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # uvloop is unavailable (e.g. on Windows), fall back to the stock asyncio loop
+
+logging.basicConfig(level=logging.WARNING)
+
+async def run_simulation_dynamic(num_cpus, total_processes, processes_per_second, speedup_simulation, burst_time, interactive_burst_time_range, use_random_interactive_burst, time_quantum, seed=None):
     """
     Run a dynamic simulation of the multi-level queue scheduler.
 
@@ -17,17 +25,18 @@ async def run_simulation_dynamic(num_cpus, total_processes, processes_per_second
         burst_time (int): Default burst time for each process.
         interactive_burst_time_range (tuple): Min and max burst time for Interactive processes.
         use_random_interactive_burst (bool): Whether to use random burst time within range for Interactive processes.
+        seed (int, optional): Seed for the random process mix and burst times; None draws a fresh one.
 
     Returns:
         tuple: Contains cpu_usage_data, queue_fill_data, and average_wait_times.
     """
     scheduler = MultiLevelQueueScheduler(num_cpus, total_processes, speedup_simulation, burst_time, time_quantum)
-    asyncio.create_task(add_processes(scheduler, total_processes, processes_per_second, burst_time, interactive_burst_time_range, use_random_interactive_burst))
+    asyncio.create_task(add_processes(scheduler, total_processes, processes_per_second, burst_time, interactive_burst_time_range, use_random_interactive_burst, seed))
     cpu_usage_data, queue_fill_data, average_wait_times = await scheduler.run_scheduler()
     return cpu_usage_data, queue_fill_data, average_wait_times
 
 
-async def run_simulation_static(num_cpus, speedup_simulation, process_settings, time_quantum, interactive_burst_time_range=None, use_random_interactive_burst=False):
+async def run_simulation_static(num_cpus, speedup_simulation, process_settings, time_quantum, interactive_burst_time_range=None, use_random_interactive_burst=False, seed=None):
     """
     Run a static simulation of the multi-level queue scheduler.
 
@@ -37,18 +46,19 @@ async def run_simulation_static(num_cpus, speedup_simulation, process_settings,
         process_settings (dict): Dictionary containing process counts and burst times for each queue type.
         interactive_burst_time_range (tuple, optional): Min and max burst time for Interactive processes.
         use_random_interactive_burst (bool): If True, assigns random burst time within range for Interactive processes.
+        seed (int, optional): Seed for the random Interactive burst times; None draws a fresh one.
 
     Returns:
         tuple: Contains cpu_usage_data, queue_fill_data, and average_wait_times.
     """
+    rng = random.Random(seed)
     scheduler = MultiLevelQueueScheduler(num_cpus, sum(settings["count"] for settings in process_settings.values()), speedup_simulation, time_quantum=time_quantum)
 
     for priority, settings in process_settings.items():
-        for i in range(settings["count"]):
-            process_name = f"{priority}_Process_{i + 1}"
-            
+        process_names = [f"{priority}_Process_{i + 1}" for i in range(settings["count"])]
+        for process_name in process_names:
             if priority == "Interactive" and use_random_interactive_burst:
-                burst_time = random.randint(interactive_burst_time_range[0], interactive_burst_time_range[1])
+                burst_time = rng.randint(interactive_burst_time_range[0], interactive_burst_time_range[1])
             else:
                 burst_time = settings["burst_time"]
             
@@ -58,6 +68,73 @@ async def run_simulation_static(num_cpus, speedup_simulation, process_settings,
     return cpu_usage_data, queue_fill_data, average_wait_times
 
 
+def run_async(coro):
+    """
+    Run a coroutine to completion, on a uvloop event loop when uvloop is available.
+
+    Args:
+        coro (coroutine): The coroutine to run.
+
+    Returns:
+        Any: The value returned by the coroutine.
+    """
+    if uvloop is not None:
+        return uvloop.run(coro)  # Runs on a private uvloop loop; the process-wide event loop policy is left alone
+    return asyncio.run(coro)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)  # Bound memory: each entry holds full telemetry arrays
+def cached_simulation_dynamic(num_cpus, total_processes, processes_per_second, speedup_simulation, burst_time, interactive_burst_time_range, use_random_interactive_burst, time_quantum, seed):
+    """
+    Run the dynamic simulation and memoize its results, so the same settings and seed replay the same run.
+
+    Takes the same arguments as run_simulation_dynamic; all of them must be hashable.
+
+    Returns:
+        tuple: Contains cpu_usage_data, queue_fill_data, and average_wait_times.
+    """
+    return run_async(run_simulation_dynamic(
+        num_cpus, total_processes, processes_per_second, speedup_simulation, burst_time, interactive_burst_time_range, use_random_interactive_burst, time_quantum, seed
+    ))
+
+
+@st.cache_data(show_spinner=False, max_entries=16)  # Bound memory: each entry holds full telemetry arrays
+def cached_simulation_static(num_cpus, speedup_simulation, process_settings_items, time_quantum, interactive_burst_time_range, use_random_interactive_burst, seed):
+    """
+    Run the static simulation and memoize its results, so the same settings and seed replay the same run.
+
+    Args:
+        process_settings_items (tuple): Tuple of (priority, count, burst_time) entries, a hashable form of process_settings.
+        Remaining arguments are the same as for run_simulation_static.
+
+    Returns:
+        tuple: Contains cpu_usage_data, queue_fill_data, and average_wait_times.
+    """
+    process_settings = {priority: {"count": count, "burst_time": burst_time} for priority, count, burst_time in process_settings_items}
+    return run_async(run_simulation_static(
+        num_cpus, speedup_simulation, process_settings, time_quantum, interactive_burst_time_range, use_random_interactive_burst, seed
+    ))
+
+
+@st.fragment
+def show_results():
+    """
+    Display the plots of the last simulation run stored in the session state.
+
+    The plot options live inside this fragment, so toggling them reruns only the fragment
+    instead of the whole script with its simulation settings.
+    """
+    if "results" not in st.session_state:
+        return
+
+    cpu_usage_data, queue_fill_data, average_wait_times = st.session_state["results"]
+    per_cpu_subplots = st.toggle("Show each CPU on its own subplot", value=False)
+    save_to_disk = st.toggle("Save plots to the plots folder", value=False)
+
+    if cpu_usage_data.size and queue_fill_data:
+        plot_results(cpu_usage_data, queue_fill_data, per_cpu_subplots=per_cpu_subplots, save_to_disk=save_to_disk)
+        plot_average_wait_time(average_wait_times, save_to_disk=save_to_disk)
+
 
 def main():
     """
@@ -103,20 +180,23 @@ def main():
         max_burst = st.number_input("Maximum Burst Time for Interactive Processes", min_value=min_burst, max_value=10, value=10)
         interactive_burst_time_range = (min_burst, max_burst)
 
+    seed = st.number_input("Random Seed", min_value=0, max_value=2**31 - 1, value=0,
+                           help="The same settings and seed replay the same run; change the seed for a new random run.")
+
     if st.button("Run Simulation"):
         with st.spinner("Running simulation..."):
             if mode == "Dynamic":
-                cpu_usage_data, queue_fill_data, average_wait_times = asyncio.run(run_simulation_dynamic(
-                    num_cpus, total_processes, processes_per_second, speedup_simulation, burst_time, interactive_burst_time_range, use_random_interactive_burst, time_quantum
-                ))
+                st.session_state["results"] = cached_simulation_dynamic(
+                    num_cpus, total_processes, processes_per_second, speedup_simulation, burst_time, interactive_burst_time_range, use_random_interactive_burst, time_quantum, seed
+                )
             else:
-                cpu_usage_data, queue_fill_data, average_wait_times = asyncio.run(run_simulation_static(
-                    num_cpus, speedup_simulation, process_settings, time_quantum, interactive_burst_time_range, use_random_interactive_burst
-                ))
+                process_settings_items = tuple((priority, settings["count"], settings["burst_time"]) for priority, settings in process_settings.items())
+                st.session_state["results"] = cached_simulation_static(
+                    num_cpus, speedup_simulation, process_settings_items, time_quantum, interactive_burst_time_range, use_random_interactive_burst, seed
+                )
 
-            if cpu_usage_data and queue_fill_data:
-                plot_results(cpu_usage_data, queue_fill_data)
-                plot_average_wait_time(average_wait_times)
+    # Keep showing the last run's results on reruns triggered by other widgets
+    show_results()
 
 if __name__ == "__main__":
     main()
@@ -1,16 +1,27 @@
 import asyncio
+import heapq
+import itertools
+import logging
 import random
 import numpy as np
 import time
-from typing import Dict, List, Tuple, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from statistics import fmean
+from typing import Awaitable, Callable, Deque, Dict, List, Tuple, Optional
 from plots import plot_results, plot_average_wait_time
 
+logger = logging.getLogger(__name__)
 
+
+@dataclass(slots=True, eq=False)
 class Process:
-    def __init__(self, name: str, burst_time: int) -> None:
-        self.name = name
-        self.burst_time = burst_time
-        self.remaining_time = burst_time  # Initially, remaining time equals burst time
+    name: str
+    burst_time: int
+    remaining_time: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.remaining_time = self.burst_time  # Initially, remaining time equals burst time
 
     def __repr__(self) -> str:
         return f"{self.name}(BT: {self.burst_time}, RT: {self.remaining_time})"
@@ -25,45 +36,138 @@ class ProcessQueue:
             algorithm (str): Algorithm used for CPU scheduling (e.g., FIFO, Round Robin).
         """
         self.name = name
-        self.queue = asyncio.Queue()  # Queue of processes for processing
+        self.queue: Deque[Process] = deque()  # Queue of processes for processing (single consumer, never blocks)
         self.new_process_count = 0
         self.wait_times: List[float] = []  # List of process wait times
-        self.timestamps: List[float] = []   # Timestamps for when processes are added to the queue
+        self.timestamps: Deque[float] = deque()   # Timestamps for when processes are added to the queue
         self.algorithm = algorithm
 
-    async def add_process(self, process: Process) -> None:
+    def add_process(self, process: Process) -> None:
         """
         Add a process to the queue and record the entry timestamp.
 
         Args:
             process (str): Name or ID of the process.
         """
-        await self.queue.put(process)
+        self.queue.append(process)
+        self.timestamps.append(time.time())
         self.new_process_count += 1
-        timestamp = time.time()
-        self.timestamps.append(timestamp)
-        print(f'Process {process} added to {self.name} queue')
+        logger.debug('Process %s added to %s queue', process, self.name)
 
-    async def get_process(self) -> str:
+    def get_process(self) -> Process:
         """
         Retrieve a process from the queue and calculate the wait time.
 
         Returns:
-            str: The process retrieved from the queue.
+            Process: The process retrieved from the queue.
         """
-        process = await self.queue.get()
-        wait_time = time.time() - self.timestamps.pop(0)
+        process = self.queue.popleft()
+        wait_time = time.time() - self.timestamps.popleft()
         self.wait_times.append(wait_time)
-        print(f'Process {process} leaving {self.name} queue. Wait time: {wait_time:.2f} s')
+        logger.debug('Process %s leaving %s queue. Wait time: %.2f s', process, self.name, wait_time)
         return process
 
-    async def is_empty(self) -> bool:
+    def peek(self) -> Process:
+        """
+        Return the process that get_process() would retrieve next, without removing it.
+
+        Returns:
+            Process: The next process in the queue.
+        """
+        return self.queue[0]
+
+    def rotate(self) -> None:
+        """
+        Move the process at the head of the queue to its tail, keeping its original entry timestamp.
+        """
+        self.queue.rotate(-1)
+        self.timestamps.rotate(-1)
+
+    def is_empty(self) -> bool:
         """Check if the queue is empty.
 
         Returns:
             bool: True if the queue is empty, False otherwise.
         """
-        return self.queue.empty()
+        return not self.queue
+
+    def qsize(self) -> int:
+        """
+        Return the number of processes waiting in the queue.
+
+        Returns:
+            int: Number of queued processes.
+        """
+        return len(self.queue)
+
+
+class SJFProcessQueue(ProcessQueue):
+    def __init__(self, name: str, algorithm: str = "SJF") -> None:
+        """
+        Initialize a Shortest Job First queue, kept as a heap ordered by burst time.
+
+        Args:
+            name (str): Name of the queue.
+            algorithm (str): Algorithm used for CPU scheduling.
+        """
+        # Same bookkeeping as ProcessQueue, but processes live in a heap instead of the queue/timestamps deques
+        self.name = name
+        self.new_process_count = 0
+        self.wait_times: List[float] = []  # List of process wait times
+        self.algorithm = algorithm
+        # (burst time, arrival order, timestamp, process) entries; arrival order keeps equal bursts FIFO
+        self._heap: List[Tuple[int, int, float, Process]] = []
+        self._arrival_counter = itertools.count()
+
+    def add_process(self, process: Process) -> None:
+        """
+        Add a process to the heap and record the entry timestamp.
+
+        Args:
+            process (str): Name or ID of the process.
+        """
+        heapq.heappush(self._heap, (process.burst_time, next(self._arrival_counter), time.time(), process))
+        self.new_process_count += 1
+        logger.debug('Process %s added to %s queue', process, self.name)
+
+    def get_process(self) -> Process:
+        """
+        Retrieve the process with the shortest burst time and calculate the wait time.
+
+        Returns:
+            Process: The shortest process.
+        """
+        _, _, timestamp, process = heapq.heappop(self._heap)
+        wait_time = time.time() - timestamp
+        self.wait_times.append(wait_time)
+        logger.debug('Process %s leaving %s queue. Wait time: %.2f s', process, self.name, wait_time)
+        return process
+
+    def peek(self) -> Process:
+        """
+        Return the process with the shortest burst time, without removing it.
+
+        Returns:
+            Process: The next process in the queue.
+        """
+        return self._heap[0][3]
+
+    def is_empty(self) -> bool:
+        """Check if the queue is empty.
+
+        Returns:
+            bool: True if the queue is empty, False otherwise.
+        """
+        return not self._heap
+
+    def qsize(self) -> int:
+        """
+        Return the number of processes waiting in the queue.
+
+        Returns:
+            int: Number of queued processes.
+        """
+        return len(self._heap)
 
 
 class CPU:
@@ -92,14 +196,14 @@ class CPU:
         process_time = min(process.remaining_time, self.burst_time)
         adjusted_time = process_time / self.speedup
 
-        print(f'CPU {self.id} starts executing process: {process.name} (remaining time: {process.remaining_time} seconds)')
-        
+        logger.debug('CPU %d starts executing process: %s (remaining time: %d seconds)', self.id, process.name, process.remaining_time)
+
         await asyncio.sleep(adjusted_time)
-        
+
         # Update remaining time after execution
         process.remaining_time -= process_time
 
-        print(f'CPU {self.id} completed executing process: {process.name}, remaining time: {process.remaining_time}')
+        logger.debug('CPU %d completed executing process: %s, remaining time: %d', self.id, process.name, process.remaining_time)
         self.is_free = True
         self.completed_process_count += 1
         self.execution_times.append(process_time)
@@ -120,17 +224,31 @@ class MultiLevelQueueScheduler:
         self.queues: Dict[str, ProcessQueue] = {
             'Real Time': ProcessQueue("Real-Time", "FIFO"),
             'System': ProcessQueue("System", "Round Robin"),
-            'Interactive': ProcessQueue("Interactive", "SJF"),
+            'Interactive': SJFProcessQueue("Interactive", "SJF"),
             'Batch': ProcessQueue("Batch", "FIFO"),
             'Low Priority': ProcessQueue("Low Priority", "Round Robin")
         }
+        # Bind each queue's dispatch method once instead of comparing algorithm names on every pass
+        dispatchers = {
+            "FIFO": self.get_next_process,
+            "Round Robin": self.get_rr_process,
+            "SJF": self.get_next_process,  # SJFProcessQueue.get_process already returns the shortest job
+        }
+        self._dispatch_table: List[Tuple[str, ProcessQueue, Callable[[ProcessQueue], Awaitable[Optional[Process]]]]] = [
+            (priority, queue, dispatchers[queue.algorithm]) for priority, queue in self.queues.items()
+        ]
         self.cpus: List[CPU] = [CPU(i, speedup_simulation, burst_time) for i in range(num_cpus)]
+        self._free_cpus: Deque[CPU] = deque(self.cpus)  # CPUs ready for dispatch; is_free is kept for telemetry
         self.completed_processes = 0
-        self.cpu_usage_data: List[List[int]] = [[] for _ in range(num_cpus)]
-        self.queue_fill_data: Dict[str, List[int]] = {key: [] for key in self.queues}
+        # Telemetry buffers, one column per sample; grown by doubling in record_usage()
+        self._cpu_usage_buf: np.ndarray = np.zeros((num_cpus, 256), dtype=np.int8)
+        self._queue_fill_buf: np.ndarray = np.zeros((len(self.queues), 256), dtype=np.int16)
+        self.samples = 0
         self.speedup_simulation = speedup_simulation
+        self._tick = max(0.01, 1.0 / speedup_simulation)  # Wall-clock length of one simulated time unit
         self.burst_time = burst_time
         self.total_processes = total_processes
+        self._wakeup = asyncio.Event()  # Set when a process arrives or a CPU becomes free
 
     async def schedule_process(self, priority: str, name: str, burst_time: int) -> None:
         """
@@ -142,7 +260,8 @@ class MultiLevelQueueScheduler:
         """
         process = Process(name, burst_time)
         queue = self.queues[priority]
-        await queue.add_process(process)
+        queue.add_process(process)
+        self._wakeup.set()
 
     async def execute_and_count(self, cpu: CPU, priority: str, process: Process) -> None:
         """
@@ -154,57 +273,100 @@ class MultiLevelQueueScheduler:
             process (str): Name or ID of the process.
         """
         await cpu.execute_process(priority, process)
+        self._free_cpus.append(cpu)
         self.completed_processes += 1
+        self._wakeup.set()
 
-    async def run_scheduler(self) -> Tuple[List[List[int]], Dict[str, List[int]], Dict[str, float]]:
+    async def run_scheduler(self) -> Tuple[np.ndarray, Dict[str, np.ndarray], Dict[str, float]]:
         """
         Run the scheduler, managing processes across multiple queues and CPUs.
 
         Returns:
             Tuple containing:
-                - CPU usage data
-                - Queue fill data
+                - CPU usage data (num_cpus x samples array)
+                - Queue fill data (one array of samples per queue)
                 - Average wait times per queue
         """
-        round_robin_counters = {key: 0 for key in self.queues if self.queues[key].algorithm == "Round Robin"}
-        
-        while True:
-            all_empty = True
-            for priority, queue in self.queues.items():
-                if not await queue.is_empty():
-                    all_empty = False
-                    process = None
-
-                    if queue.algorithm == "Round Robin":
-                        process = await self.get_rr_process(queue)
-                        round_robin_counters[priority] += 1
-                    elif queue.algorithm == "FIFO":
-                        process = await queue.get_process()
-                    elif queue.algorithm == "SJF":
-                        process = await self.get_sjf_process(queue)
+        # Start dispatched tasks eagerly so they run up to their first real await (Python 3.12+);
+        # the caller's task factory is restored afterwards, since the loop may be shared
+        loop = asyncio.get_running_loop()
+        previous_task_factory = loop.get_task_factory()
+        eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+        if eager_task_factory is not None:
+            loop.set_task_factory(eager_task_factory)
 
-                    if process:
-                        available_cpu = next((cpu for cpu in self.cpus if cpu.is_free), None)
-                        if available_cpu:
-                            available_cpu.is_free = False
-                            asyncio.create_task(self.execute_and_count(available_cpu, priority, process))
-                        else:
-                            await queue.add_process(process)
+        try:
+            sampler = asyncio.create_task(self.sample_usage())
 
-                for i, cpu in enumerate(self.cpus):
-                    self.cpu_usage_data[i].append(0 if cpu.is_free else 1)
+            while self.completed_processes < self.total_processes:
+                self._wakeup.clear()
+                placed = False  # A process was started on a CPU
+                charged = False  # A Round Robin process was charged a time quantum and rotated
 
-                for priority, queue in self.queues.items():
-                    self.queue_fill_data[priority].append(queue.queue.qsize())
+                for priority, queue, dispatch in self._dispatch_table:
+                    if queue.is_empty():
+                        continue
 
-            if all_empty and self.completed_processes == self.total_processes:
-                print("All processes have been completed.")
-                break
+                    # Only take work off a queue when there is a CPU to run it on
+                    if not self._free_cpus:
+                        break
 
-            await asyncio.sleep(1/( self.speedup_simulation // 10))
+                    process = await dispatch(queue)
+
+                    if process:
+                        available_cpu = self._free_cpus.popleft()
+                        available_cpu.is_free = False
+                        asyncio.create_task(self.execute_and_count(available_cpu, priority, process))
+                        placed = True
+                    else:
+                        charged = True
+
+                if charged:
+                    await asyncio.sleep(self._tick)  # Charging a quantum takes one scheduler tick, not an instant re-run
+                elif placed:
+                    await asyncio.sleep(0)  # Let producers and CPUs run before the next dispatch pass
+                else:
+                    await self._wakeup.wait()  # Nothing to dispatch until a process arrives or a CPU frees up
+
+            logger.info("All processes have been completed.")
+            sampler.cancel()
+            try:
+                await sampler
+            except asyncio.CancelledError:
+                pass
+        finally:
+            loop.set_task_factory(previous_task_factory)
+
+        self.record_usage()
+
+        # Compact the recorded samples into contiguous matrices; queue rows are views into one buffer
+        cpu_usage_data = np.ascontiguousarray(self._cpu_usage_buf[:, :self.samples])
+        queue_fill_matrix = np.ascontiguousarray(self._queue_fill_buf[:, :self.samples])
+        queue_fill_data = dict(zip(self.queues, queue_fill_matrix))
+        return cpu_usage_data, queue_fill_data, self.average_wait_times()
+
+    def record_usage(self) -> None:
+        """
+        Record a single sample of CPU usage and queue fill levels.
+        """
+        tick = self.samples
+        if tick == self._cpu_usage_buf.shape[1]:
+            self._cpu_usage_buf = np.concatenate((self._cpu_usage_buf, np.zeros_like(self._cpu_usage_buf)), axis=1)
+            self._queue_fill_buf = np.concatenate((self._queue_fill_buf, np.zeros_like(self._queue_fill_buf)), axis=1)
+
+        self._cpu_usage_buf[:, tick] = [0 if cpu.is_free else 1 for cpu in self.cpus]
+        self._queue_fill_buf[:, tick] = [queue.qsize() for queue in self.queues.values()]
+        self.samples += 1
+
+    async def sample_usage(self) -> None:
+        """
+        Periodically sample CPU usage and queue fill levels until cancelled.
+        """
+        while True:
+            self.record_usage()
+            # One sample per simulated time unit, matching the time axis of the plots
+            await asyncio.sleep(self._tick)
 
-        return self.cpu_usage_data, self.queue_fill_data, self.average_wait_times()
-    
     def get_process_time(self, process: str) -> int:
         """
         Retrieve the execution time for a given process based on its type.
@@ -218,61 +380,40 @@ class MultiLevelQueueScheduler:
 
         return self.burst_time
 
-    async def get_rr_process(self, queue: ProcessQueue) -> Optional[Process]:
+    async def get_next_process(self, queue: ProcessQueue) -> Optional[Process]:
         """
-        Retrieve and process the next Round Robin task from the queue.
+        Retrieve the next task from a FIFO or SJF queue; the queue class decides which process comes next.
 
         Args:
             queue (ProcessQueue): The queue from which to retrieve the process.
 
         Returns:
-            Optional[Process]: The Process object being executed.
+            Optional[Process]: The head of a FIFO queue, or the shortest job of an SJF queue.
         """
-        process = await queue.get_process()
-        
-        # Check if the process can be completed
-        if process.remaining_time <= self.time_quantum:
-            print(f'Process {process.name} has completed execution.')
-            return process  # Process completed successfully
+        return queue.get_process()
 
-        # If remaining time exceeds time quantum, attempt to execute
-        while process.remaining_time > 0:
-            time_to_run = min(process.remaining_time, self.time_quantum)
-            process.remaining_time -= time_to_run
-            
-            print(f'Process {process.name} needs more time, {process.remaining_time} seconds remain, staying in queue.')
-            await queue.add_process(process)  # Re-add process to the queue
-            return None  # Return None to indicate it needs to be processed again later
-
-        print(f'Process {process.name} could not be completed. Marking as complete or moving to another queue.')
-        self.completed_processes += 1  # Mark as completed
-        return process  # Return the process that was skipped
-
-
-    async def get_sjf_process(self, queue: ProcessQueue) -> Optional[Process]:
+    async def get_rr_process(self, queue: ProcessQueue) -> Optional[Process]:
         """
-        Retrieve the shortest job from the queue.
+        Retrieve and process the next Round Robin task from the queue.
 
         Args:
             queue (ProcessQueue): The queue from which to retrieve the process.
 
         Returns:
-            Optional[Process]: The shortest Process object.
+            Optional[Process]: The Process object being executed.
         """
-        processes = [await queue.get_process() for _ in range(queue.queue.qsize())]
-        if not processes:
-            return None
+        process = queue.peek()
 
-        # Sort processes based on burst time
-        processes.sort(key=lambda p: p.burst_time)
-        selected_process = processes[0]
-        
-        # Re-add the remaining processes back into the queue
-        for process in processes:
-            if process != selected_process:
-                await queue.add_process(process)
+        # Check if the process can be completed
+        if process.remaining_time <= self.time_quantum:
+            logger.debug('Process %s has completed execution.', process.name)
+            return queue.get_process()  # Process completed successfully
 
-        return selected_process
+        # Otherwise use up one time quantum and move the process to the back of the queue in place
+        process.remaining_time -= self.time_quantum
+        logger.debug('Process %s needs more time, %d seconds remain, staying in queue.', process.name, process.remaining_time)
+        queue.rotate()
+        return None  # Return None to indicate it needs to be processed again later
 
 
     def average_wait_times(self) -> Dict[str, float]:
@@ -282,10 +423,10 @@ class MultiLevelQueueScheduler:
         Returns:
             Dict[str, float]: A dictionary with average wait times for each queue.
         """
-        return {key: np.mean(queue.wait_times) if queue.wait_times else 0 for key, queue in self.queues.items()}
+        return {key: fmean(queue.wait_times) if queue.wait_times else 0.0 for key, queue in self.queues.items()}
 
 
-async def add_processes(scheduler: MultiLevelQueueScheduler, total_processes: int, processes_per_second: int, burst_time: int, interactive_burst_time_range: tuple, use_random_interactive_burst: bool) -> None:
+async def add_processes(scheduler: MultiLevelQueueScheduler, total_processes: int, processes_per_second: int, burst_time: int, interactive_burst_time_range: tuple, use_random_interactive_burst: bool, seed: Optional[int] = None) -> None:
     """
     Continuously add processes to the scheduler with configurable burst times.
 
@@ -296,14 +437,24 @@ async def add_processes(scheduler: MultiLevelQueueScheduler, total_processes: in
         burst_time (int): Default burst time for non-interactive processes.
         interactive_burst_time_range (tuple): Min and max burst time for Interactive processes.
         use_random_interactive_burst (bool): If True, assigns random burst time within range for Interactive processes.
+        seed (Optional[int]): Seed for the process generator's private random number generator.
     """
+    rng = random.Random(seed)
+
+    # Draw all priorities (and random Interactive burst times) and build names up front instead of once per process
+    process_names = [f'Process_{i + 1}' for i in range(total_processes)]
+    priorities_pool = list(scheduler.queues.keys())
+    priorities = rng.choices(priorities_pool, k=total_processes)
+    if use_random_interactive_burst:
+        interactive_burst_times = rng.choices(range(interactive_burst_time_range[0], interactive_burst_time_range[1] + 1), k=total_processes)
+
     for i in range(total_processes):
         await asyncio.sleep(1 / processes_per_second)
-        process_name = f'Process_{i + 1}'
-        priority = random.choice(list(scheduler.queues.keys()))
+        process_name = process_names[i]
+        priority = priorities[i]
 
         if priority == "Interactive" and use_random_interactive_burst:
-            process_burst_time = random.randint(interactive_burst_time_range[0], interactive_burst_time_range[1])
+            process_burst_time = interactive_burst_times[i]
         else:
             process_burst_time = burst_time
 
@@ -1,102 +1,448 @@
 import os
-import matplotlib.pyplot as plt
+import logging
+import threading
+from io import BytesIO
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import matplotlib
+matplotlib.use("Agg")  # Render off-screen; must be selected before anything imports matplotlib.pyplot
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Tuple
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 from matplotlib.ticker import MaxNLocator
 import streamlit as st
 
 
+logger = logging.getLogger(__name__)
+
 plots_folder = "plots"
-os.makedirs(plots_folder, exist_ok=True)
+_CPU_PLOT = os.path.join(plots_folder, "cpu_usage_plot.png")
+_QUEUE_PLOT = os.path.join(plots_folder, "queue_fill_plot.png")
+_AVGWAIT_PLOT = os.path.join(plots_folder, "average_wait_time_plot.png")
+_PLOTS_DIR_READY = False
+
+# PNG encoding dominates savefig time; trade slightly larger files for much faster compression
+_SAVEFIG_KWARGS = {"dpi": 100, "pil_kwargs": {"compress_level": 1}}
+
+# Figures reused across reruns, keyed by (kind, layout); each entry is [figure, axes, data drawn on it, PNG bytes]
+_FIG_CACHE: "OrderedDict[Tuple, list]" = OrderedDict()
+_FIG_CACHE_SIZE = 8
+_FIG_LOCK = threading.Lock()  # Streamlit sessions run in threads and share the cached figures
+
+# Writes rendered PNGs to disk off the calling thread; a single worker keeps writes to the same file in order
+_IO_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plots-io")
 
-def plot_results(cpu_usage_data: List[List[int]], queue_fill_data: Dict[str, List[int]]) -> None:
+# Series longer than this are downsampled before plotting; a 16-inch figure cannot show more points anyway
+_LTTB_THRESHOLD = 4000
+_LTTB_POINTS = 2000
+
+# Vertical distance between CPU rows when all CPUs share one axes; the gap keeps 0/1 traces from touching
+_CPU_ROW_OFFSET = 1.2
+
+def _ensure_dir() -> None:
     """
-    Plot CPU usage and queue fill levels over time.
-    
+    Create the plots folder the first time a plot is saved instead of on import.
+    """
+    global _PLOTS_DIR_READY
+    if not _PLOTS_DIR_READY:
+        os.makedirs(plots_folder, exist_ok=True)
+        _PLOTS_DIR_READY = True
+
+def _adjust_stacked_layout(fig: Figure, height: float) -> None:
+    """
+    Apply fixed margins to a figure of vertically stacked subplots, avoiding a constrained layout pass on every draw.
+
+    Args:
+        fig (Figure): The figure to adjust.
+        height (float): Figure height in inches, used to keep the title margins constant in absolute size.
+    """
+    fig.subplots_adjust(left=0.1, right=0.98, top=1 - 1.0 / height, bottom=0.7 / height, hspace=0.6)
+
+def _lttb(y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a series with the Largest-Triangle-Three-Buckets algorithm, preserving its visual shape.
+
+    Args:
+        y (np.ndarray): Samples taken at x = 0, 1, ..., len(y) - 1.
+        n_out (int): Number of points to keep (at least 3).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The x positions and values of the kept points.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n), y
+
+    # The first and last samples are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    avg_x = (edges[:-1] + edges[1:] - 1) / 2
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1]) / np.diff(edges)
+    # Each bucket is compared against the average of the following bucket (or the last sample)
+    next_x = np.append(avg_x[1:], n - 1)
+    next_y = np.append(avg_y[1:], y[-1])
+
+    xs = np.empty(n_out, dtype=np.int64)
+    xs[0], xs[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        areas = np.abs((a - next_x[b]) * (y[lo:hi] - y[a]) - (a - np.arange(lo, hi)) * (next_y[b] - y[a]))
+        a = lo + int(np.argmax(areas))
+        xs[b + 1] = a
+
+    return xs, y[xs]
+
+def _rle_binary_numpy(arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorised implementation of _rle_binary for a contiguous int8 array.
+    """
+    edges = np.flatnonzero(np.diff(arr, prepend=arr[0] ^ 1, append=arr[-1] ^ 1))
+    return edges, arr[np.clip(edges, 0, len(arr) - 1)]
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; without it the vectorised NumPy version is used
+    _rle_binary_kernel = _rle_binary_numpy
+else:
+    @njit(cache=True)
+    def _rle_binary_kernel(arr):
+        # Single pass over the samples, recording the start of every run and then the series end
+        n = arr.shape[0]
+        xs = np.empty(n + 1, np.int64)
+        ys = np.empty(n + 1, np.int8)
+        k = 0
+        prev = -1
+        for i in range(n):
+            if arr[i] != prev:
+                prev = arr[i]
+                xs[k] = i
+                ys[k] = prev
+                k += 1
+        xs[k] = n
+        ys[k] = prev
+        return xs[:k + 1], ys[:k + 1]
+
+def _rle_binary(usage: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a 0/1 series to the points where its value changes, for drawing with a post-step plot.
+
+    Args:
+        usage (np.ndarray): Binary samples taken at x = 0, 1, ..., len(usage) - 1.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The x positions of each run start (plus the series end) and the run values.
+    """
+    return _rle_binary_kernel(np.ascontiguousarray(usage, dtype=np.int8))
+
+def _get_cached_figure(key: Tuple, figsize: Tuple[float, float], num_axes: int) -> list:
+    """
+    Return the cached [figure, axes, drawn data, PNG bytes] entry for a layout, creating the figure on first use.
+
+    Args:
+        key (Tuple): Figure kind and layout (e.g. number of subplots and time steps).
+        figsize (Tuple[float, float]): Figure size in inches, used when the figure is created.
+        num_axes (int): Number of vertically stacked subplots.
+
+    Returns:
+        list: The cache entry; the caller redraws the axes and updates the drawn data and PNG bytes.
+    """
+    entry = _FIG_CACHE.get(key)
+    if entry is not None:
+        _FIG_CACHE.move_to_end(key)
+        return entry
+
+    fig = Figure(figsize=figsize, dpi=_SAVEFIG_KWARGS["dpi"])  # Draw at the saved resolution so nothing is rescaled
+    axs: List[Axes] = list(np.atleast_1d(fig.subplots(num_axes, 1)))
+    entry = [fig, axs, None, b""]
+    _FIG_CACHE[key] = entry
+    if len(_FIG_CACHE) > _FIG_CACHE_SIZE:
+        _FIG_CACHE.popitem(last=False)  # Figures are not registered with pyplot, dropping them is enough
+    return entry
+
+def _write_png(path: str, image: bytes) -> None:
+    """
+    Write encoded PNG bytes to disk.
+
+    Args:
+        path (str): File the PNG is written to.
+        image (bytes): The encoded PNG image.
+    """
+    with open(path, "wb") as f:
+        f.write(image)
+
+def _log_write_error(future: Future) -> None:
+    """
+    Log a failed background PNG write, which would otherwise be lost with its future.
+
+    Args:
+        future (Future): The finished write submitted by _save_png.
+    """
+    error = future.exception()
+    if error is not None:
+        logger.error("Saving plot failed: %s", error, exc_info=error)
+
+def _save_png(path: str, image: bytes) -> None:
+    """
+    Queue a rendered PNG for writing to disk, so the image can be displayed while it is saved.
+
     Args:
-        cpu_usage_data (List[List[int]]): A 2D list where each sublist represents CPU usage over time for each CPU.
-        queue_fill_data (Dict[str, List[int]]): A dictionary with queue names as keys and their fill levels over time as values.
+        path (str): File the PNG is written to.
+        image (bytes): The encoded PNG image.
+    """
+    _ensure_dir()
+    # The worker only sees the immutable bytes, never the figure, so the figure can be redrawn meanwhile
+    _IO_POOL.submit(_write_png, path, image).add_done_callback(_log_write_error)
+
+def _render_png(fig: Figure) -> bytes:
+    """
+    Render a figure to PNG once, so the same image can be displayed and saved without re-rendering.
+
+    Args:
+        fig (Figure): The figure to render.
+
+    Returns:
+        bytes: The encoded PNG image.
+    """
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png", **_SAVEFIG_KWARGS)
+    return buffer.getvalue()
+
+def _draw_stacked_cpus(fig: Figure, ax: Axes, cpu_usage_data: np.ndarray, first_draw: bool) -> None:
+    """
+    Draw all CPUs on one axes, each line shifted up by its row offset.
+
+    Args:
+        fig (Figure): The CPU usage figure.
+        ax (Axes): Its only axes.
+        cpu_usage_data (np.ndarray): A contiguous int8 array of shape (num_cpus, time steps) with the CPU usage samples.
+        first_draw (bool): The figure is new, so its lines and static decorations must be created first.
     """
     num_cpus = len(cpu_usage_data)
-    time_steps = range(len(cpu_usage_data[0]))
+    if first_draw:
+        _adjust_stacked_layout(fig, fig.get_figheight())
+        fig.suptitle('CPU Usage Over Time', fontsize=18)
 
-    fig, axs = plt.subplots(num_cpus, 1, figsize=(16, 4 * num_cpus), constrained_layout=True)
-    fig.suptitle('CPU Usage Over Time', fontsize=18)
+        for i in range(num_cpus):
+            ax.add_line(Line2D([], [], drawstyle='steps-post', color="tab:blue", alpha=0.7, rasterized=True))
+        ax.set_yticks([_CPU_ROW_OFFSET * i + 0.5 for i in range(num_cpus)])
+        ax.set_yticklabels([f'CPU {i}' for i in range(num_cpus)])
+        ax.set_xlabel('Time (simulation units)', fontsize=12)
+        ax.set_title('CPU Usage (low = free, high = busy)', fontsize=14)
+        ax.grid(True, axis='x')
 
-    if num_cpus == 1:
-        axs = [axs]
+    for i, (line, usage) in enumerate(zip(ax.lines, cpu_usage_data)):
+        # Usage is piecewise constant, so only the value changes need to be drawn
+        xs, ys = _rle_binary(usage)
+        line.set_data(xs, ys + _CPU_ROW_OFFSET * i)
+    ax.relim()
+    ax.autoscale_view()
 
-    for i, usage in enumerate(cpu_usage_data):
-        axs[i].plot(usage, label=f'CPU {i}', color="tab:blue", alpha=0.7)
-        axs[i].set_title(f'CPU {i} Usage', fontsize=14)
-        axs[i].set_xlabel('Time (simulation units)', fontsize=12)
-        axs[i].set_ylabel('CPU Usage\n(0 = free,\n1 = busy)', fontsize=12, rotation=0, labelpad=30)
-        axs[i].legend(loc='upper right')
-        axs[i].grid()
-        axs[i].yaxis.set_major_locator(MaxNLocator(integer=True))
+def _draw_cpu_subplots(fig: Figure, axs: List[Axes], cpu_usage_data: np.ndarray, first_draw: bool) -> None:
+    """
+    Draw every CPU on its own subplot.
 
+    Args:
+        fig (Figure): The CPU usage figure.
+        axs (List[Axes]): One subplot per CPU.
+        cpu_usage_data (np.ndarray): A contiguous int8 array of shape (num_cpus, time steps) with the CPU usage samples.
+        first_draw (bool): The figure is new, so its lines and static decorations must be created first.
+    """
+    if first_draw:
+        _adjust_stacked_layout(fig, fig.get_figheight())
+        fig.suptitle('CPU Usage Over Time', fontsize=18)
 
-    cpu_usage_plot_path = os.path.join(plots_folder, "cpu_usage_plot.png")
-    plt.savefig(cpu_usage_plot_path)
-    print(f"CPU Usage plot saved at: {cpu_usage_plot_path}")
+        for i, ax in enumerate(axs):
+            ax.add_line(Line2D([], [], drawstyle='steps-post', label=f'CPU {i}', color="tab:blue", alpha=0.7, rasterized=True))
+            ax.set_title(f'CPU {i} Usage', fontsize=14)
+            ax.set_xlabel('Time (simulation units)', fontsize=12)
+            ax.set_ylabel('CPU Usage\n(0 = free,\n1 = busy)', fontsize=12, rotation=0, labelpad=30)
+            ax.legend(loc='upper right')
+            ax.grid()
+            ax.yaxis.set_major_locator(MaxNLocator(integer=True))
 
-    st.pyplot(fig)
-    plt.close(fig)
+    for ax, usage in zip(axs, cpu_usage_data):
+        # Usage is piecewise constant, so only the value changes need to be drawn
+        ax.lines[0].set_data(*_rle_binary(usage))
+        ax.relim()
+        ax.autoscale_view()
 
-    # Queue Fill Plot
+def _render_cpu_figure(cpu_usage_data: np.ndarray, per_cpu_subplots: bool = False) -> bytes:
+    """
+    Draw the CPU usage figure and render it to PNG, skipping both when the data is unchanged.
+
+    Args:
+        cpu_usage_data (np.ndarray): A contiguous int8 array of shape (num_cpus, time steps) with the CPU usage samples.
+        per_cpu_subplots (bool): Draw every CPU on its own subplot instead of stacking them on a single axes.
+
+    Returns:
+        bytes: The CPU usage figure as PNG.
+    """
+    num_cpus, time_steps = cpu_usage_data.shape
+    if per_cpu_subplots:
+        height, num_axes = 4 * num_cpus, num_cpus
+    else:
+        height, num_axes = 2 + 0.6 * num_cpus, 1
+    entry = _get_cached_figure(("cpu", per_cpu_subplots, num_cpus, time_steps), (16, height), num_axes)
+    fig, axs, drawn, image = entry
+    data = cpu_usage_data.tobytes()
+    if drawn == data:
+        return image
+
+    if per_cpu_subplots:
+        _draw_cpu_subplots(fig, axs, cpu_usage_data, first_draw=drawn is None)
+    else:
+        _draw_stacked_cpus(fig, axs[0], cpu_usage_data, first_draw=drawn is None)
+
+    image = _render_png(fig)
+
+    entry[2:] = [data, image]
+    return image
+
+
+def _render_queue_figure(queue_fill_data: Dict[str, np.ndarray]) -> bytes:
+    """
+    Draw the queue fill level figure and render it to PNG, skipping both when the data is unchanged.
+
+    Args:
+        queue_fill_data (Dict[str, np.ndarray]): A dictionary with queue names as keys and their fill levels over time as values.
+
+    Returns:
+        bytes: The queue fill level figure as PNG.
+    """
     num_queues = len(queue_fill_data)
-    fig2, axs2 = plt.subplots(num_queues, 1, figsize=(16, 4 * num_queues), constrained_layout=True)
-    fig2.suptitle('Queue Fill Levels Over Time', fontsize=18)
+    fill_rows = list(queue_fill_data.values())
+    time_steps = max(len(fill_data) for fill_data in fill_rows)
+    if all(len(fill_data) == time_steps for fill_data in fill_rows):
+        # Equal lengths: one matrix gives contiguous rows and a single copy for change detection
+        fill_rows = np.asarray(fill_rows)  # Keeps the scheduler's int16 samples instead of upcasting
+        data = (tuple(queue_fill_data), fill_rows.tobytes())
+    else:
+        data = tuple((priority, np.asarray(fill_data).tobytes()) for priority, fill_data in queue_fill_data.items())
 
-    if num_queues == 1:
-        axs2 = [axs2]
+    entry = _get_cached_figure(("queue", tuple(queue_fill_data), time_steps), (16, 4 * num_queues), num_queues)
+    fig, axs, drawn, image = entry
+    if drawn == data:
+        return image
 
-    for i, (priority, fill_data) in enumerate(queue_fill_data.items()):
-        axs2[i].plot(fill_data, label=f'{priority} Queue', color="tab:orange", alpha=0.7)
-        axs2[i].set_title(f'{priority} Queue Fill Level', fontsize=14)
-        axs2[i].set_xlabel('Time (simulation units)', fontsize=12)
-        axs2[i].set_ylabel('Processes\nin Queue', fontsize=12, rotation=0, labelpad=30)
-        axs2[i].legend(loc='upper right')
-        axs2[i].grid()
-        axs2[i].yaxis.set_major_locator(MaxNLocator(integer=True))
+    if drawn is None:
+        # New figure: create the lines and static decorations once, later draws only update line data
+        _adjust_stacked_layout(fig, 4 * num_queues)
+        fig.suptitle('Queue Fill Levels Over Time', fontsize=18)
 
+        for ax, priority in zip(axs, queue_fill_data):
+            ax.add_line(Line2D([], [], label=f'{priority} Queue', color="tab:orange", alpha=0.7, rasterized=True))
+            ax.set_title(f'{priority} Queue Fill Level', fontsize=14)
+            ax.set_xlabel('Time (simulation units)', fontsize=12)
+            ax.set_ylabel('Processes\nin Queue', fontsize=12, rotation=0, labelpad=30)
+            ax.legend(loc='upper right')
+            ax.grid()
+            ax.yaxis.set_major_locator(MaxNLocator(integer=True))
 
-    queue_fill_plot_path = os.path.join(plots_folder, "queue_fill_plot.png")
-    plt.savefig(queue_fill_plot_path)
-    print(f"Queue Fill Levels plot saved at: {queue_fill_plot_path}")
+    x = np.arange(time_steps)  # Shared by all queues; shorter series use a view of its prefix
+    for ax, fill_data in zip(axs, fill_rows):
+        if len(fill_data) > _LTTB_THRESHOLD:
+            ax.lines[0].set_data(*_lttb(fill_data, _LTTB_POINTS))
+        else:
+            ax.lines[0].set_data(x[:len(fill_data)], fill_data)
+        ax.relim()
+        ax.autoscale_view()
 
-    st.pyplot(fig2)
-    plt.close(fig2)
+    image = _render_png(fig)
 
+    entry[2:] = [data, image]
+    return image
 
-def plot_average_wait_time(average_wait_times: Dict[str, float]) -> None:
+
+def _render_average_wait_time_figure(average_wait_times: Dict[str, float]) -> bytes:
     """
-    Plot the average wait time for different types of processes.
+    Draw the average wait time figure and render it to PNG, skipping both when the data is unchanged.
 
     Args:
         average_wait_times (Dict[str, float]): A dictionary with process types as keys and their average wait times as values.
+
+    Returns:
+        bytes: The average wait time figure as PNG.
     """
-    average_times = {key: np.mean(times) for key, times in average_wait_times.items()}
+    entry = _get_cached_figure(("average_wait_time", len(average_wait_times)), (10, 5), 1)
+    fig, (ax,), drawn, image = entry
+    data = tuple(average_wait_times.items())
+    if drawn == data:
+        return image
+
+    # The scheduler already reports one mean per queue, so convert them in a single pass
+    keys = list(average_wait_times.keys())
+    means = np.fromiter(average_wait_times.values(), dtype=np.float64, count=len(keys))
 
-    fig, ax = plt.subplots(figsize=(10, 5))
-    bars = ax.bar(average_times.keys(), average_times.values(), color='skyblue')
+    fig.subplots_adjust(left=0.1, right=0.97, top=0.9, bottom=0.3)
+    ax.clear()
+    bars = ax.bar(keys, means, color='skyblue')
     ax.set_xlabel('Process Type', fontsize=12)
     ax.set_ylabel("Average Time Spent in Queue (s)", fontsize=12)
     ax.set_title("Average Time Spent in Queue by Different Types of Processes", fontsize=14)
-    ax.set_xticks(range(len(average_times)))
-    ax.set_xticklabels(average_times.keys(), rotation=45)
+    ax.tick_params(axis='x', labelrotation=45)  # The categorical keys already label the ticks
     ax.grid(axis='y')
+    ax.bar_label(bars, labels=[f'{mean:.2f} s' for mean in means], padding=2)
+    ax.margins(y=0.1)  # Headroom so the tallest label stays clear of the title
+
+    image = _render_png(fig)
+
+    entry[2:] = [data, image]
+    return image
+
+
+def plot_results(cpu_usage_data: np.ndarray, queue_fill_data: Dict[str, np.ndarray], per_cpu_subplots: bool = False, save_to_disk: bool = False) -> None:
+    """
+    Plot CPU usage and queue fill levels over time.
+    
+    Args:
+        cpu_usage_data (np.ndarray): A 2D array where each row represents CPU usage over time for each CPU.
+        queue_fill_data (Dict[str, np.ndarray]): A dictionary with queue names as keys and their fill levels over time as values.
+        per_cpu_subplots (bool): Draw every CPU on its own subplot (slower, useful for inspecting a single CPU).
+        save_to_disk (bool): Also save both plots as PNG files in the plots folder.
+    """
+    # Convert once; every CPU row is then a contiguous slice of the same buffer
+    cpu_arr = np.ascontiguousarray(cpu_usage_data, dtype=np.int8)
+
+    # Nothing has been sampled yet (e.g. a rerun before the first simulation step)
+    if cpu_arr.ndim != 2 or not cpu_arr.size or not queue_fill_data:
+        return
+
+    with _FIG_LOCK:
+        cpu_image = _render_cpu_figure(cpu_arr, per_cpu_subplots)
+        queue_image = _render_queue_figure(queue_fill_data)
+
+    if save_to_disk:
+        _save_png(_CPU_PLOT, cpu_image)
+        logger.debug("CPU Usage plot saved at: %s", _CPU_PLOT)
+        _save_png(_QUEUE_PLOT, queue_image)
+        logger.debug("Queue Fill Levels plot saved at: %s", _QUEUE_PLOT)
+
+    st.image(cpu_image)
+    st.image(queue_image)
+
 
+def plot_average_wait_time(average_wait_times: Dict[str, float], save_to_disk: bool = False) -> None:
+    """
+    Plot the average wait time for different types of processes.
+
+    Args:
+        average_wait_times (Dict[str, float]): A dictionary with process types as keys and their average wait times as values.
+        save_to_disk (bool): Also save the plot as a PNG file in the plots folder.
+    """
+    if not average_wait_times:
+        return
 
-    for bar in bars:
-        yval = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width() / 2, yval, f'{yval:.2f} s', ha='center', va='bottom')
+    with _FIG_LOCK:
+        image = _render_average_wait_time_figure(average_wait_times)
 
-    average_wait_time_plot_path = os.path.join(plots_folder, "average_wait_time_plot.png")
-    plt.savefig(average_wait_time_plot_path)
-    print(f"Average Wait Time plot saved at: {average_wait_time_plot_path}")
+    if save_to_disk:
+        _save_png(_AVGWAIT_PLOT, image)
+        logger.debug("Average Wait Time plot saved at: %s", _AVGWAIT_PLOT)
 
-    st.pyplot(fig)
-    plt.close(fig)
+    st.image(image)
 
 